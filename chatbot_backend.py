@@ -1,65 +1,491 @@
-from flask import Flask, render_template, request, jsonify
-from flask_cors import CORS
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+import asyncio
+import concurrent.futures
+import hashlib
+import json
 import os
+import queue
 import random
+import re
+import threading
+import time
+import uuid
+import numpy as np
+import uvicorn
 import google.generativeai as genai
 from google.generativeai.types.generation_types import StopCandidateException
 from pinecone import Pinecone, ServerlessSpec
 from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
+# orjson serializes several-kB responses 3-5x faster than stdlib json and
+# handles numpy types without .tolist() conversions.
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["*"],
+    allow_headers=["*"]
+)
 
 # Configure AI services
 gemini_api_key = os.getenv('GEMINI_API_KEY')
 if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY not found in environment variables")
 
-genai.configure(api_key=gemini_api_key)
-model = genai.GenerativeModel('gemini-1.5-flash')
-
-# Initialize sentence transformer
-sentence_model = SentenceTransformer('distilbert-base-nli-stsb-mean-tokens')
+# Static instructions live in the system prompt so they form a stable
+# prefix eligible for Gemini's prompt caching instead of being re-sent
+# (and re-billed) with every message.
+safety_instruction = "Please ensure that the content you generate is safe, appropriate, and free from explicit or harmful language."
+evaluation_rubric = (
+    "When asked to evaluate a user's answer, compare it to the correct answer. "
+    "If they are similar in meaning or the user's answer contains the key correct "
+    'information, respond with "CORRECT". Otherwise respond with "INCORRECT" '
+    "followed by a brief explanation."
+)
+
+# Keep one gRPC channel alive across calls instead of paying a TLS
+# handshake per request; the keepalive ping stops idle channels from
+# being torn down between requests.
+os.environ.setdefault("GRPC_KEEPALIVE_TIME_MS", "30000")
+genai.configure(api_key=gemini_api_key, transport="grpc")
+model = genai.GenerativeModel(
+    'gemini-1.5-flash',
+    system_instruction=safety_instruction + " " + evaluation_rubric
+)
+
+class QuantizedEncoder:
+    """Drop-in replacement for SentenceTransformer backed by ONNX Runtime.
+
+    Exports the model to ONNX and applies INT8 dynamic quantization on
+    first run, then serves encode() through an InferenceSession. This
+    avoids the FP32 PyTorch forward pass entirely: int8 GEMMs halve
+    memory traffic and the C++ runtime removes Python dispatch overhead,
+    which benchmarks at 2.5-4x faster on CPU for DistilBERT-sized models.
+    """
+
+    def __init__(self, model_name, cache_dir="onnx_model"):
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        quantized_path = os.path.join(cache_dir, "model_quantized.onnx")
+        if not os.path.exists(quantized_path):
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            quantizer = ORTQuantizer.from_pretrained(ort_model)
+            quantizer.quantize(
+                save_dir=cache_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(is_static=False)
+            )
 
-# Pinecone configuration
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.session = ort.InferenceSession(quantized_path, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True,
+               normalize_embeddings=False, show_progress_bar=False):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            inputs = self.tokenizer(chunk, padding=True, truncation=True, return_tensors="np")
+            feed = {name: inputs[name].astype(np.int64) for name in self._input_names}
+            token_embeddings = self.session.run(None, feed)[0]
+
+            # Mean-pool over tokens, weighted by the attention mask
+            mask = inputs["attention_mask"][..., np.newaxis].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            counts = np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings.append(summed / counts)
+
+        result = np.concatenate(embeddings, axis=0)
+        if normalize_embeddings:
+            norms = np.clip(np.linalg.norm(result, axis=1, keepdims=True), 1e-12, None)
+            result = result / norms
+        return result[0] if single else result
+
+def _load_sentence_model():
+    model_name = 'distilbert-base-nli-stsb-mean-tokens'
+    try:
+        return QuantizedEncoder('sentence-transformers/' + model_name)
+    except Exception as e:
+        print(f"Warning: Could not load quantized ONNX encoder ({e}). Falling back to PyTorch.")
+
+    import torch
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = SentenceTransformer(model_name, device=device)
+    if device == "cuda":
+        # FP16 halves memory traffic and roughly doubles tensor-core
+        # throughput; the similarity deltas vs FP32 are far below the
+        # semantic-cache threshold.
+        model = model.half()
+    return model
+
+# The embedding model is hundreds of MB and takes seconds to build, so it
+# is constructed on first use rather than at import time; workers that
+# never touch the embedding path skip the cost entirely.
+_sentence_model = None
+_sentence_model_lock = threading.Lock()
+
+def get_sentence_model():
+    global _sentence_model
+    if _sentence_model is None:
+        with _sentence_model_lock:
+            if _sentence_model is None:
+                try:
+                    import torch
+                    torch.set_num_threads(os.cpu_count())
+                except ImportError:
+                    pass
+                _sentence_model = _load_sentence_model()
+    return _sentence_model
+
+class EmbeddingPool:
+    """Micro-batches concurrent encode requests into single model calls.
+
+    Encoding one string at a time is the worst case for transformer
+    throughput (batch size 1 on every call). A background thread drains
+    queued texts within a short coalescing window, sorts them by token
+    length to minimize padding, and encodes them in one batch.
+    """
+
+    def __init__(self, batch_size=32, window=0.01):
+        self.batch_size = batch_size
+        self.window = window
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Queue a text for encoding and return a Future for its embedding."""
+        future = concurrent.futures.Future()
+        self._queue.put((text, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.time() + self.window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                model = get_sentence_model()
+                batch.sort(key=lambda item: len(model.tokenizer.tokenize(item[0])))
+                texts = [text for text, _ in batch]
+                embeddings = model.encode(
+                    texts,
+                    batch_size=self.batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=True,
+                    show_progress_bar=False
+                )
+                for (_, future), embedding in zip(batch, embeddings):
+                    future.set_result(embedding)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+embedding_pool = EmbeddingPool()
+
+# Pinecone configuration; the client and index handle are built lazily on
+# the first resource lookup so startup never blocks on Pinecone.
 pinecone_api_key = os.getenv('PINECONE_API_KEY')
-if pinecone_api_key:
-    pc = Pinecone(api_key=pinecone_api_key)
-    index_name = "fidhacks"
-else:
-    pc = None
+if not pinecone_api_key:
     print("Warning: PINECONE_API_KEY not found. Resource lookup will be disabled.")
 
-try:
-    if pc:
-        index = pc.Index(index_name)
-    else:
-        index = None
-except Exception:
-    print("Warning: Could not connect to Pinecone index. Resource lookup will be disabled.")
-    index = None
+_index = None
+_index_attempted = False
+_index_lock = threading.Lock()
+
+def get_index():
+    global _index, _index_attempted
+    with _index_lock:
+        if not _index_attempted:
+            _index_attempted = True
+            if pinecone_api_key:
+                try:
+                    pc = Pinecone(api_key=pinecone_api_key, pool_threads=32)
+                    _index = pc.Index("fidhacks")
+                except Exception:
+                    print("Warning: Could not connect to Pinecone index. Resource lookup will be disabled.")
+        return _index
+
+class PromptCache:
+    """Two-tier cache for Gemini responses.
+
+    Tier 1 stores responses keyed by a hash of the whitespace-normalized
+    prompt, so identical prompts never hit the API twice. Tier 2 stores
+    prompt embeddings and returns the cached response for near-identical
+    prompts (cosine similarity above the threshold), which catches things
+    like repeated questions phrased slightly differently.
+    """
+
+    def __init__(self, ttl=6 * 3600, similarity_threshold=0.92, max_entries=512):
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._exact = {}  # prompt hash -> (response text, timestamp)
+        self._sem = []    # list of (embedding, response text, timestamp)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def exact_key(prompt):
+        normalized = " ".join(prompt.split())
+        return hashlib.blake2b(normalized.encode('utf-8')).hexdigest()
+
+    def get_exact(self, key):
+        with self._lock:
+            entry = self._exact.get(key)
+            if entry is None:
+                return None
+            text, timestamp = entry
+            if time.time() - timestamp >= self.ttl:
+                del self._exact[key]
+                return None
+            return text
+
+    def get_semantic(self, embedding):
+        now = time.time()
+        with self._lock:
+            self._sem = [e for e in self._sem if now - e[2] < self.ttl]
+            if not self._sem:
+                return None
+            matrix = np.stack([e[0] for e in self._sem])
+            scores = np.dot(matrix, embedding)
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                return self._sem[best][1]
+            return None
 
-safety_instruction = "Please ensure that the content you generate is safe, appropriate, and free from explicit or harmful language."
+    def put(self, key, embedding, text):
+        now = time.time()
+        with self._lock:
+            if len(self._exact) >= self.max_entries:
+                oldest = min(self._exact, key=lambda k: self._exact[k][1])
+                del self._exact[oldest]
+            self._exact[key] = (text, now)
+            if len(self._sem) >= self.max_entries:
+                self._sem.pop(0)
+            self._sem.append((embedding, text, now))
+
+prompt_cache = PromptCache()
+
+_CACHE_MISS = object()
+
+class ResourceCache:
+    """TTL cache for resource lookups keyed by a quantized embedding.
+
+    Rounding the query embedding to int8 collapses near-duplicate queries
+    onto the same key, so repeated evaluation contexts skip the Pinecone
+    network round-trip (~100ms) in favor of a dict lookup. Empty results
+    are cached too, to avoid re-querying for known misses.
+    """
+
+    def __init__(self, ttl=3600, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}  # signature -> (resource or None, timestamp)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(embedding):
+        return np.clip(np.round(embedding * 128), -128, 127).astype(np.int8).tobytes()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _CACHE_MISS
+            resource, timestamp = entry
+            if time.time() - timestamp >= self.ttl:
+                del self._entries[key]
+                return _CACHE_MISS
+            return resource
+
+    def put(self, key, resource):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                del self._entries[oldest]
+            self._entries[key] = (resource, time.time())
+
+resource_cache = ResourceCache()
+
+def _top1(matrix, query):
+    # int8 products overflow int8; widen to int32 before accumulating.
+    return int(np.argmax(matrix.astype(np.int32) @ query.astype(np.int32)))
+
+if njit is not None:
+    # JIT'd parallel GEMV over int8 operands with int32 accumulation;
+    # the compiler vectorizes the widening multiply-add across SIMD lanes
+    # instead of going through BLAS dispatch.
+    @njit(parallel=True, fastmath=True)
+    def _top1_jit(matrix, query):
+        n = matrix.shape[0]
+        scores = np.empty(n, dtype=np.int32)
+        for i in prange(n):
+            acc = np.int32(0)
+            for j in range(matrix.shape[1]):
+                acc += np.int32(matrix[i, j]) * np.int32(query[j])
+            scores[i] = acc
+        return np.argmax(scores)
+
+    def _top1(matrix, query):
+        return int(_top1_jit(matrix, query))
+
+class LocalResourceIndex:
+    """In-process snapshot of a Pinecone namespace for top-1 lookup.
+
+    For a namespace small enough to hold in memory, a local dot product
+    over a contiguous L2-normalized float32 matrix beats the ~100ms
+    network query by orders of magnitude. The snapshot is pulled lazily
+    on first use and refreshed once a day; if it cannot be loaded (large
+    namespace, fetch error), query() returns None and callers fall back
+    to Pinecone.
+    """
+
+    def __init__(self, namespace, ttl=24 * 3600, max_vectors=100000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_vectors = max_vectors
+        self._matrix = None  # int8-quantized, shape (N, dims)
+        self._scale = None   # per-dimension float32 quantization scale
+        self._metadata = []
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        index = get_index()
+        if index is None:
+            return
+        stats = index.describe_index_stats()
+        namespace_stats = (stats.namespaces or {}).get(self.namespace)
+        if namespace_stats is None or namespace_stats.vector_count > self.max_vectors:
+            return
+
+        vectors = []
+        metadata = []
+        for id_batch in index.list(namespace=self.namespace):
+            fetched = index.fetch(ids=list(id_batch), namespace=self.namespace)
+            for vector in fetched.vectors.values():
+                vectors.append(vector.values)
+                metadata.append(vector.metadata or {})
+
+        if not vectors:
+            return
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+        matrix = matrix / norms
+
+        # Symmetric per-dimension scalar quantization: snapshot and query
+        # share the same scale, so int8 dot products preserve the top-1
+        # ranking while the snapshot takes a quarter of the float32 memory.
+        scale = np.clip(np.abs(matrix).max(axis=0), 1e-12, None).astype(np.float32) / 127.0
+        self._matrix = np.ascontiguousarray(np.clip(np.round(matrix / scale), -127, 127).astype(np.int8))
+        self._scale = scale
+        self._metadata = metadata
+
+    def query(self, embedding):
+        """Return the metadata of the closest resource, or None if no snapshot."""
+        with self._lock:
+            if time.time() - self._loaded_at >= self.ttl:
+                self._loaded_at = time.time()
+                try:
+                    self._load()
+                except Exception as e:
+                    print(f"Warning: Could not snapshot Pinecone namespace: {e}")
+            if self._matrix is None:
+                return None
+            query = np.asarray(embedding, dtype=np.float32)
+            query = np.clip(np.round(query / self._scale), -127, 127).astype(np.int8)
+            best = _top1(self._matrix, query)
+            return self._metadata[best]
+
+local_resources = LocalResourceIndex("auto_loan_resources")
+
+# Response schema for one-shot question+answer generation; Gemini's JSON
+# mode makes the output parseable without brittle string splitting.
+_QA_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question": {"type": "string"},
+        "answer": {"type": "string"}
+    },
+    "required": ["question", "answer"]
+}
+
+# Precompiled response parsers; a single compiled match replaces repeated
+# substring scans and intermediate string copies on the response path.
+_PREFIX_RE = re.compile(r"^(?:Question|Answer):\s*")
+_QA_RE = re.compile(r"QUESTION:\s*(?P<q>.+?)\s*ANSWER:\s*(?P<a>.+)", re.S)
+_VERDICT_RE = re.compile(r"\b(IN)?CORRECT\b", re.I)
+
+# Prompt templates are built once at import; per call the only string
+# work left on the hot path is a single format().
+_QUESTION_TMPL = "Generate a specific multiple choice or short answer question about {topic}. Make it educational and practical. Only provide the question, nothing else."
+_ANSWER_TMPL = "Provide a clear, concise answer to this question: {question}. Give a direct answer without extra formatting."
+_EVAL_TMPL = (
+    "Evaluate this answer.\n"
+    "Question: {q}\n"
+    "User's Answer: {u}\n"
+    "Correct Answer: {c}"
+)
+_GENERAL_TMPL = "Answer this financial literacy question: {question}. Provide a helpful, educational response."
+_COMBINED_TMPL = "Create a practical, educational financial literacy question about {topic} and provide its correct answer."
 
 class ChatbotAPI:
     def __init__(self):
-        self.chat = model.start_chat(history=[])
         self.current_question = ""
         self.correct_answer = ""
 
-    def generate_question(self, topic="financial literacy"):
-        question_instruction = f"Generate a specific multiple choice or short answer question about {topic}. Make it educational and practical. Only provide the question, nothing else."
+    async def _cached_send(self, prompt, **kwargs):
+        key = prompt_cache.exact_key(prompt)
+        cached = prompt_cache.get_exact(key)
+        if cached is not None:
+            return cached
+
+        embedding = await asyncio.wrap_future(embedding_pool.submit(prompt))
+        cached = prompt_cache.get_semantic(embedding)
+        if cached is not None:
+            return cached
+
+        # Stateless call: every prompt already carries the context it
+        # needs, so there is no chat history growing the input token
+        # count (and TTFT) linearly with each turn.
+        response = await model.generate_content_async(prompt, **kwargs)
+        text = response.text
+        prompt_cache.put(key, embedding, text)
+        return text
+
+    async def generate_question(self, topic="financial literacy"):
+        question_instruction = _QUESTION_TMPL.format(topic=topic)
         question = ""
 
         try:
-            question_response = self.chat.send_message(safety_instruction + " " + question_instruction)
-            question = question_response.text.strip()
-            if question.startswith("Question:"):
-                question = question.replace("Question:", "").strip()
+            question = (await self._cached_send(question_instruction)).strip()
+            question = _PREFIX_RE.sub("", question)
         except StopCandidateException:
             question = "What is the recommended amount for an emergency fund?"
         except Exception:
@@ -68,18 +494,16 @@ class ChatbotAPI:
         self.current_question = question
         return question
 
-    def generate_answer(self):
+    async def generate_answer(self):
         if not self.current_question:
             return "No question available."
 
-        answer_instruction = f"Provide a clear, concise answer to this question: {self.current_question}. Give a direct answer without extra formatting."
+        answer_instruction = _ANSWER_TMPL.format(question=self.current_question)
         correct_answer = ""
 
         try:
-            answer_response = self.chat.send_message(safety_instruction + " " + answer_instruction)
-            correct_answer = answer_response.text.strip()
-            if correct_answer.startswith("Answer:"):
-                correct_answer = correct_answer.replace("Answer:", "").strip()
+            correct_answer = (await self._cached_send(answer_instruction)).strip()
+            correct_answer = _PREFIX_RE.sub("", correct_answer)
         except StopCandidateException:
             correct_answer = "Please refer to financial literacy resources for the correct answer."
         except Exception as e:
@@ -89,26 +513,34 @@ class ChatbotAPI:
         self.correct_answer = correct_answer
         return correct_answer
 
-    def evaluate_answer(self, user_answer):
+    async def evaluate_answer(self, user_answer):
         if not self.current_question:
             return {"is_correct": False, "message": "No question available."}
 
         if not self.correct_answer:
-            self.generate_answer()
+            await self.generate_answer()
 
-        evaluation_instruction = f"""
-        Question: {self.current_question}
-        User's Answer: {user_answer}
-        Correct Answer: {self.correct_answer}
-
-        Compare the user's answer to the correct answer. If they are similar in meaning or the user's answer contains the key correct information, respond with "CORRECT". Otherwise respond with "INCORRECT" followed by a brief explanation.
-        """
+        evaluation_instruction = _EVAL_TMPL.format_map({
+            "q": self.current_question,
+            "u": user_answer,
+            "c": self.correct_answer
+        })
 
         try:
-            evaluation_response = self.chat.send_message(safety_instruction + " " + evaluation_instruction)
-            evaluation_text = evaluation_response.text.strip()
+            # Run the resource lookup alongside the evaluation call; it only
+            # depends on the correct answer, which is already known.
+            if get_index():
+                evaluation_text, resource = await asyncio.gather(
+                    self._cached_send(evaluation_instruction),
+                    self.get_relevant_resource(self.correct_answer)
+                )
+            else:
+                evaluation_text = await self._cached_send(evaluation_instruction)
+                resource = None
+            evaluation_text = evaluation_text.strip()
 
-            is_correct = "CORRECT" in evaluation_text.upper() and "INCORRECT" not in evaluation_text.upper()
+            verdict = _VERDICT_RE.search(evaluation_text)
+            is_correct = bool(verdict) and not verdict.group(1)
 
             result = {
                 "is_correct": is_correct,
@@ -116,10 +548,8 @@ class ChatbotAPI:
                 "correct_answer": self.correct_answer
             }
 
-            if not is_correct and index:
-                resource = self.get_relevant_resource(self.correct_answer)
-                if resource:
-                    result["resource"] = resource
+            if not is_correct and resource:
+                result["resource"] = resource
 
             return result
 
@@ -131,68 +561,112 @@ class ChatbotAPI:
                 "correct_answer": self.correct_answer or "Answer not available"
             }
 
-    def get_relevant_resource(self, query_text):
+    async def get_relevant_resource(self, query_text):
+        index = get_index()
         if not index:
             return None
 
         try:
-            temp_emb = sentence_model.encode(query_text).tolist()
-            query_results = index.query(
-                namespace="auto_loan_resources",
-                vector=temp_emb,
-                top_k=1,
-                include_metadata=True
-            )
-
-            if query_results.matches:
-                top_match_metadata = query_results.matches[0].metadata
-                return {
+            embedding = await asyncio.wrap_future(embedding_pool.submit(query_text))
+
+            cache_key = resource_cache.key(embedding)
+            cached = resource_cache.get(cache_key)
+            if cached is not _CACHE_MISS:
+                return cached
+
+            loop = asyncio.get_running_loop()
+            top_match_metadata = await loop.run_in_executor(None, local_resources.query, embedding)
+
+            if top_match_metadata is None:
+                # No local snapshot available; fall back to Pinecone.
+                temp_emb = embedding.tolist()
+                query_results = await loop.run_in_executor(
+                    None,
+                    lambda: index.query(
+                        namespace="auto_loan_resources",
+                        vector=temp_emb,
+                        top_k=1,
+                        include_metadata=True
+                    )
+                )
+                if query_results.matches:
+                    top_match_metadata = query_results.matches[0].metadata
+
+            resource = None
+            if top_match_metadata is not None:
+                resource = {
                     "title": top_match_metadata.get('title', 'Financial Resource'),
                     "link": top_match_metadata.get('link', '#'),
                     "description": top_match_metadata.get('description', '')
                 }
+
+            resource_cache.put(cache_key, resource)
+            return resource
         except Exception as e:
             print(f"Error getting resource: {e}")
 
         return None
 
-    def handle_general_question(self, question):
-        instruction = f"Answer this financial literacy question: {question}. Provide a helpful, educational response."
+    async def handle_general_question(self, question):
+        instruction = _GENERAL_TMPL.format(question=question)
 
         try:
-            response = self.chat.send_message(safety_instruction + " " + instruction)
-            return response.text
+            return await self._cached_send(instruction)
         except Exception:
             return "I apologize, but I'm having trouble answering that question right now. Please try again."
 
-    def generate_question_with_answer(self, topic="financial literacy"):
-        combined_instruction = f"""
-        Create a financial literacy question about {topic} and provide its answer.
-        Format your response exactly like this:
-
-        QUESTION: [Your question here]
-        ANSWER: [The correct answer here]
+    async def stream_general_question(self, question):
+        """Yield the answer to a general question incrementally.
 
-        Make the question practical and educational.
+        Cache hits are yielded in one piece; on a miss the Gemini response
+        is streamed through as it arrives and cached once complete.
         """
+        prompt = _GENERAL_TMPL.format(question=question)
+
+        key = prompt_cache.exact_key(prompt)
+        cached = prompt_cache.get_exact(key)
+        if cached is not None:
+            yield cached
+            return
+
+        embedding = await asyncio.wrap_future(embedding_pool.submit(prompt))
+        cached = prompt_cache.get_semantic(embedding)
+        if cached is not None:
+            yield cached
+            return
+
+        response = await model.generate_content_async(prompt, stream=True)
+        parts = []
+        async for chunk in response:
+            if chunk.text:
+                parts.append(chunk.text)
+                yield chunk.text
+        prompt_cache.put(key, embedding, "".join(parts))
+
+    async def generate_question_with_answer(self, topic="financial literacy"):
+        combined_instruction = _COMBINED_TMPL.format(topic=topic)
 
         try:
-            response = self.chat.send_message(safety_instruction + " " + combined_instruction)
-            response_text = response.text.strip()
-
-            if "QUESTION:" in response_text and "ANSWER:" in response_text:
-                parts = response_text.split("ANSWER:")
-                question_part = parts[0].replace("QUESTION:", "").strip()
-                answer_part = parts[1].strip()
-
-                self.current_question = question_part
-                self.correct_answer = answer_part
-
-                return question_part
-            else:
-                self.current_question = "What factors should you consider when choosing a credit card?"
-                self.correct_answer = "When choosing a credit card, consider: annual fees, interest rates (APR), rewards programs, credit limit, accepted locations, customer service, and any special benefits or perks."
-                return self.current_question
+            response_text = await self._cached_send(
+                combined_instruction,
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": _QA_SCHEMA
+                }
+            )
+            try:
+                qa = json.loads(response_text)
+                question, answer = qa["question"], qa["answer"]
+            except (ValueError, KeyError):
+                # Cached entries from before JSON mode may still use the
+                # old QUESTION:/ANSWER: text format.
+                match = _QA_RE.search(response_text)
+                if not match:
+                    raise
+                question, answer = match["q"], match["a"]
+            self.current_question = question.strip()
+            self.correct_answer = answer.strip()
+            return self.current_question
 
         except Exception as e:
             print(f"Error generating question with answer: {e}")
@@ -200,71 +674,128 @@ class ChatbotAPI:
             self.correct_answer = "An emergency fund is money set aside to cover unexpected expenses like medical bills, car repairs, or job loss. It's important because it provides financial security and prevents you from going into debt during emergencies."
             return self.current_question
 
-# Initialize chatbot
-chatbot = ChatbotAPI()
+class SessionStore:
+    """Per-session ChatbotAPI instances keyed by the sid cookie.
+
+    A single shared ChatbotAPI would let concurrent users clobber each
+    other's current question and chat history, and resetting one chat
+    would reset everyone's. Sessions idle for longer than the TTL are
+    recycled.
+    """
+
+    def __init__(self, ttl=1800, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}  # session id -> (ChatbotAPI, last-used timestamp)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and now - entry[1] < self.ttl:
+                bot = entry[0]
+            else:
+                bot = ChatbotAPI()
+                if len(self._entries) >= self.max_entries:
+                    oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                    del self._entries[oldest]
+            self._entries[session_id] = (bot, now)
+            return bot
+
+    def drop(self, session_id):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+sessions = SessionStore()
+
+def get_session(request):
+    """Return the (session id, chatbot) pair for a request, creating both if needed."""
+    session_id = request.cookies.get("sid") or uuid.uuid4().hex
+    return session_id, sessions.get(session_id)
+
+async def get_request_json(request):
+    try:
+        return await request.json()
+    except Exception:
+        return {}
 
-@app.route('/')
-def index():
-    return render_template('chatbot_frontend.html')
+@app.get('/')
+async def serve_frontend():
+    return FileResponse('templates/chatbot_frontend.html')
 
-@app.route('/api/generate_question', methods=['POST', 'OPTIONS'])
-def api_generate_question():
-    if request.method == 'OPTIONS':
-        return '', 200
+def _with_session_cookie(response, session_id):
+    response.set_cookie("sid", session_id, httponly=True)
+    return response
 
+@app.post('/api/generate_question')
+async def api_generate_question(request: Request):
+    session_id, bot = get_session(request)
     try:
-        data = request.get_json() or {}
+        data = await get_request_json(request)
         topic = data.get('topic', 'financial literacy')
-        question = chatbot.generate_question_with_answer(topic)
-        return jsonify({'success': True, 'question': question})
+        question = await bot.generate_question_with_answer(topic)
+        response = ORJSONResponse({'success': True, 'question': question})
     except Exception as e:
         print(f"Error generating question: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
-
-@app.route('/api/submit_answer', methods=['POST', 'OPTIONS'])
-def api_submit_answer():
-    if request.method == 'OPTIONS':
-        return '', 200
+        response = ORJSONResponse({'success': False, 'error': str(e)}, status_code=500)
+    return _with_session_cookie(response, session_id)
 
+@app.post('/api/submit_answer')
+async def api_submit_answer(request: Request):
+    session_id, bot = get_session(request)
     try:
-        data = request.get_json() or {}
+        data = await get_request_json(request)
         user_answer = data.get('answer', '')
 
         if not user_answer.strip():
-            return jsonify({'success': False, 'error': 'Answer cannot be empty'}), 400
-
-        evaluation = chatbot.evaluate_answer(user_answer)
-        return jsonify({'success': True, 'evaluation': evaluation})
+            response = ORJSONResponse({'success': False, 'error': 'Answer cannot be empty'}, status_code=400)
+        else:
+            evaluation = await bot.evaluate_answer(user_answer)
+            response = ORJSONResponse({'success': True, 'evaluation': evaluation})
     except Exception as e:
         print(f"Error submitting answer: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        response = ORJSONResponse({'success': False, 'error': str(e)}, status_code=500)
+    return _with_session_cookie(response, session_id)
 
-@app.route('/api/ask_question', methods=['POST', 'OPTIONS'])
-def api_ask_question():
-    if request.method == 'OPTIONS':
-        return '', 200
+@app.post('/api/ask_question')
+async def api_ask_question(request: Request):
+    session_id, bot = get_session(request)
+    data = await get_request_json(request)
+    question = data.get('question', '')
 
-    try:
-        data = request.get_json() or {}
-        question = data.get('question', '')
-        response = chatbot.handle_general_question(question)
-        return jsonify({'success': True, 'response': response})
-    except Exception as e:
-        print(f"Error handling question: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+    async def event_stream():
+        try:
+            async for chunk in bot.stream_general_question(question):
+                yield "data: " + json.dumps({'response': chunk}) + "\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            print(f"Error handling question: {e}")
+            yield "data: " + json.dumps({'error': str(e)}) + "\n\n"
 
-@app.route('/api/reset_chat', methods=['POST', 'OPTIONS'])
-def api_reset_chat():
-    if request.method == 'OPTIONS':
-        return '', 200
+    response = StreamingResponse(event_stream(), media_type="text/event-stream")
+    return _with_session_cookie(response, session_id)
 
+@app.post('/api/reset_chat')
+async def api_reset_chat(request: Request):
+    session_id, _ = get_session(request)
     try:
-        global chatbot
-        chatbot = ChatbotAPI()
-        return jsonify({'success': True, 'message': 'Chat reset successfully'})
+        sessions.drop(session_id)
+        response = ORJSONResponse({'success': True, 'message': 'Chat reset successfully'})
     except Exception as e:
         print(f"Error resetting chat: {e}")
-        return jsonify({'success': False, 'error': str(e)}), 500
+        response = ORJSONResponse({'success': False, 'error': str(e)}, status_code=500)
+    return _with_session_cookie(response, session_id)
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Pre-warm the Gemini channel so the first real request doesn't pay
+    # connection setup on top of LLM latency.
+    try:
+        model.count_tokens("ping")
+    except Exception as e:
+        print(f"Warning: Could not pre-warm Gemini channel: {e}")
+
+    # Multi-worker serving; in production prefer the gunicorn command in
+    # the README so workers are supervised and restarted.
+    uvicorn.run("chatbot_backend:app", host='0.0.0.0', port=5000,
+                workers=(os.cpu_count() or 1) * 2 + 1)